@@ -3,20 +3,53 @@
 # Version 1.8.2
 # ASCII ONLY. No Unicode. No smart quotes. No special dashes.
 
+import base64
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
+import hashlib
+import hmac
+from html import escape
+import json
+from operator import itemgetter
+import os
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+from urllib.parse import urlencode
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
 import streamlit.components.v1 as components
+from urllib3.util.retry import Retry
 
 APP_VERSION = "1.8.2"
 
 LOGO_URL = "https://fishynw.com/wp-content/uploads/2025/07/FishyNW-Logo-transparent-with-letters-e1755409608978.png"
+LOGO_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Fishynw-logo.png")
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 
 HEADERS = {
     "User-Agent": "FishyNW-App-1.8.2",
     "Accept": "application/json",
 }
 
+# On-disk response cache: survives process restarts and is shared by all
+# sessions. st.cache_data stays the first (in-memory) layer above it.
+HTTP_CACHE_DIR = os.path.join(tempfile.gettempdir(), "fishynw_http_cache")
+# IP lookups run server side, so one shared fix serves every session
+IP_CACHE_TTL_S = 24 * 3600
+GEOCODE_DISK_TTL_S = 90 * 24 * 3600
+SUN_DISK_TTL_S = 30 * 24 * 3600
+# Every distinct query adds a file: sweep now and then, dropping entries no
+# TTL can still serve and the oldest ones beyond the cap
+HTTP_CACHE_MAX_FILES = 5000
+HTTP_CACHE_SWEEP_S = 3600
+
 # -------------------------------------------------
 # Page config (NO SIDEBAR)
 # -------------------------------------------------
@@ -29,41 +62,35 @@ st.set_page_config(
 # -------------------------------------------------
 # Session defaults
 # -------------------------------------------------
-if "tool" not in st.session_state:
+SESSION_DEFAULTS = {
     # Default to Best fishing times
-    st.session_state["tool"] = "Best fishing times"
-
-if "lat" not in st.session_state:
-    st.session_state["lat"] = None
-if "lon" not in st.session_state:
-    st.session_state["lon"] = None
-
-if "best_go" not in st.session_state:
-    st.session_state["best_go"] = False
-
-if "best_place" not in st.session_state:
-    st.session_state["best_place"] = ""
-if "best_place_matches" not in st.session_state:
-    st.session_state["best_place_matches"] = []
-if "best_place_choice" not in st.session_state:
-    st.session_state["best_place_choice"] = ""
-if "best_place_display" not in st.session_state:
-    st.session_state["best_place_display"] = ""
-
-if "wind_place" not in st.session_state:
-    st.session_state["wind_place"] = ""
-if "wind_place_matches" not in st.session_state:
-    st.session_state["wind_place_matches"] = []
-if "wind_place_choice" not in st.session_state:
-    st.session_state["wind_place_choice"] = ""
-if "wind_place_display" not in st.session_state:
-    st.session_state["wind_place_display"] = ""
+    "tool": "Best fishing times",
+    "lat": None,
+    "lon": None,
+    "loc_source": "",
+    "best_go": False,
+    "best_place": "",
+    "best_place_matches": [],
+    "best_place_choice": "",
+    "best_place_display": "",
+    "wind_place": "",
+    "wind_place_matches": [],
+    "wind_place_choice": "",
+    "wind_place_display": "",
+}
+
+if "_initialized" not in st.session_state:
+    for key, value in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, list(value) if isinstance(value, list) else value)
+    st.session_state["_initialized"] = True
 
 # -------------------------------------------------
-# Force-hide sidebar (reliable)
+# Styles (force-hide sidebar + neutral, light green buttons, light red
+# primary action buttons)
+# One block, one markdown call. Must be sent every rerun: Streamlit
+# drops elements that a rerun does not re-emit.
 # -------------------------------------------------
-st.markdown(
-    """
+APP_CSS = """
 <style>
 /* Hide sidebar across Streamlit DOM variants */
 section[data-testid="stSidebar"],
@@ -87,17 +114,7 @@ button[data-testid="collapsedControl"],
   display: none !important;
   visibility: hidden !important;
 }
-</style>
-""",
-    unsafe_allow_html=True,
-)
 
-# -------------------------------------------------
-# Styles (neutral + light green buttons with contrast)
-# -------------------------------------------------
-st.markdown(
-    """
-<style>
 .block-container {
   padding-top: 1.05rem;
   padding-bottom: 2.75rem;
@@ -174,7 +191,6 @@ st.markdown(
 .bul li { margin-bottom: 6px; }
 
 /* Global button styling (light green, high contrast) */
-button[kind="primary"],
 button,
 div.stButton > button {
   background-color: #8fd19e !important;
@@ -183,7 +199,6 @@ div.stButton > button {
   font-weight: 700 !important;
   border-radius: 10px !important;
 }
-button[kind="primary"]:hover,
 button:hover,
 div.stButton > button:hover {
   background-color: #7cc78f !important;
@@ -200,206 +215,572 @@ div.stButton > button:disabled {
   color: #6b6b6b !important;
   border-color: #b6d6c1 !important;
 }
+
+/* Page action buttons (type="primary"): light red */
+div.stButton > button[kind="primary"],
+div.stButton > button[data-testid="stBaseButton-primary"] {
+  background-color: #f4a3a3 !important;
+  color: #3b0a0a !important;
+  border: 1px solid #e48f8f !important;
+  font-weight: 900 !important;
+}
+div.stButton > button[kind="primary"]:hover,
+div.stButton > button[data-testid="stBaseButton-primary"]:hover {
+  background-color: #ee9292 !important;
+  color: #2b0707 !important;
+}
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
-def get_json(url, timeout=10):
-    r = requests.get(url, headers=HEADERS, timeout=timeout)
-    r.raise_for_status()
-    return r.json()
+@st.cache_resource
+def http_session():
+    # Keep-alive connection pool shared by every rerun, session and worker thread
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # Retry-After is ignored: a 429 could otherwise hold the script thread for
+    # as long as the server asks. Two quick backoff retries at most.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.25,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # IP lookup is best effort: fail fast instead of retrying a slow service
+    session.mount("https://ipinfo.io/", HTTPAdapter(max_retries=0))
+    return session
+
+def _disk_cache_path(url):
+    return os.path.join(HTTP_CACHE_DIR, hashlib.md5(url.encode("utf-8")).hexdigest() + ".json")
+
+def _read_disk_cache(url, max_age_s):
+    try:
+        path = _disk_cache_path(url)
+        if time.time() - os.path.getmtime(path) < max_age_s:
+            with open(path) as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return None
+
+@st.cache_resource
+def disk_sweep_state():
+    return {"last": 0.0, "lock": threading.Lock()}
+
+def _sweep_disk_cache():
+    state = disk_sweep_state()
+    now = time.time()
+    with state["lock"]:
+        if now - state["last"] < HTTP_CACHE_SWEEP_S:
+            return
+        state["last"] = now
+    max_age_s = max(IP_CACHE_TTL_S, GEOCODE_DISK_TTL_S, SUN_DISK_TTL_S)
+    entries = []
+    for entry in os.scandir(HTTP_CACHE_DIR):
+        try:
+            mtime = entry.stat().st_mtime
+            # Leftover .tmp files are only live for the length of one write
+            if now - mtime > (60 if entry.name.endswith(".tmp") else max_age_s):
+                os.remove(entry.path)
+            else:
+                entries.append((mtime, entry.path))
+        except OSError:
+            pass
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - HTTP_CACHE_MAX_FILES)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _write_disk_cache(url, data):
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=HTTP_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, _disk_cache_path(url))
+        _sweep_disk_cache()
+    except Exception:
+        pass
+
+def api_url(base, params):
+    # Commas stay literal for list params like daily=sunrise,sunset
+    return base + "?" + urlencode(params, safe=",")
+
+class NetStats(NamedTuple):
+    calls: deque    # (source, seconds, endpoint) for calls that reached get_json
+    lookups: Counter  # cached fetcher name -> calls
+    misses: Counter   # cached fetcher name -> calls that ran the body
+
+# Stats of the session the current thread works for. Set on the script
+# thread each run and around pool tasks; unset for process-wide work, so
+# nothing from one visitor is ever recorded where another can see it.
+_net_local = threading.local()
+
+def net_stats():
+    if "_net_stats" not in st.session_state:
+        st.session_state["_net_stats"] = NetStats(deque(maxlen=200), Counter(), Counter())
+    return st.session_state["_net_stats"]
+
+def _current_stats():
+    return getattr(_net_local, "stats", None)
+
+def _log_call(source, seconds, url):
+    stats = _current_stats()
+    if stats is not None:
+        # Endpoint only: the query string holds place names and coordinates
+        stats.calls.append((source, seconds, url.split("?", 1)[0]))
+
+def cache_lookup(name, fetch, *args):
+    stats = _current_stats()
+    if stats is not None:
+        stats.lookups[name] += 1
+    return fetch(*args)
+
+def note_cache_miss(name):
+    # Called first thing in a cached body, which only runs on a miss
+    stats = _current_stats()
+    if stats is not None:
+        stats.misses[name] += 1
+
+def get_json(url, timeout=10, disk_ttl=None, valid=None, refresh=False):
+    # disk_ttl (seconds): serve/store the response in HTTP_CACHE_DIR.
+    # valid(data) gates the disk write so an error body is never kept;
+    # refresh skips the disk read and always asks the service.
+    t0 = time.perf_counter()
+    if disk_ttl and not refresh:
+        data = _read_disk_cache(url, disk_ttl)
+        if data is not None:
+            _log_call("disk", time.perf_counter() - t0, url)
+            return data
+
+    try:
+        r = http_session().get(url, timeout=timeout)
+        r.raise_for_status()
+        data = r.json()
+    finally:
+        _log_call("net", time.perf_counter() - t0, url)
+
+    if disk_ttl and (valid is None or valid(data)):
+        _write_disk_cache(url, data)
+    return data
+
+WINDOW_CARD_TMPL = (
+    "<div class='card compact-card'><div class='card-title'>%s</div>"
+    "<div class='card-value'>%s - %s</div></div>"
+)
+WIND_CARD_TMPL = (
+    "<div class='card compact-card'><div class='card-title'>%s</div>"
+    "<div class='card-value'>%s mph</div></div>"
+)
+USING_TMPL = "<div class='small'><strong>Using:</strong> %s</div>"
+
+def fmt_time(t):
+    # Same as strftime("%I:%M %p").lstrip("0"), without the format parse
+    return "%d:%02d %s" % (t.hour % 12 or 12, t.minute, "AM" if t.hour < 12 else "PM")
 
 def normalize_place_query(s):
     s = "" if s is None else str(s)
     s = " ".join(s.strip().split())
     return s
 
-def inject_button_color_by_text(button_text, bg_hex, fg_hex, border_hex, delay_ms=60):
-    safe_text = button_text.replace("\\", "\\\\").replace('"', '\\"')
-    components.html(
-        """
-<script>
-(function() {
-  var targetText = "%s";
-  var delay = %d;
-  var bg = "%s";
-  var fg = "%s";
-  var border = "%s";
-
-  function styleBtn(btn) {
-    try {
-      // Use IMPORTANT so it beats your global CSS !important
-      btn.style.setProperty("background-color", bg, "important");
-      btn.style.setProperty("color", fg, "important");
-      btn.style.setProperty("border", "1px solid " + border, "important");
-      btn.style.setProperty("font-weight", "900", "important");
-      btn.style.setProperty("border-radius", "10px", "important");
-    } catch (e) {}
-  }
-
-  function findButton() {
-    try {
-      var buttons = Array.prototype.slice.call(document.querySelectorAll("button"));
-      for (var i = 0; i < buttons.length; i++) {
-        var b = buttons[i];
-        var t = (b.innerText || "").trim();
-        if (t === targetText) return b;
-      }
-    } catch (e) {}
-    return null;
-  }
-
-  setTimeout(function() {
-    var btn = findButton();
-    if (btn) { styleBtn(btn); return; }
-
-    var tries = 0;
-    var iv = setInterval(function() {
-      tries += 1;
-      var b = findButton();
-      if (b) {
-        clearInterval(iv);
-        styleBtn(b);
-      }
-      if (tries >= 25) clearInterval(iv);
-    }, 200);
-  }, delay);
-})();
-</script>
-""" % (safe_text, int(delay_ms), bg_hex, fg_hex, border_hex),
-        height=0,
-    )
-
 # -------------------------------------------------
 # Location / Geocoding
 # -------------------------------------------------
-def get_location():
+IP_FAIL_RETRY_S = 60
+
+@st.cache_resource
+def ip_lookup_state():
+    # Process-wide: the lookup runs on the server, so an ipinfo outage is the
+    # same for every session and one failure can spare all of them the wait
+    return {"fail_ts": 0.0}
+
+def get_location(force=False):
+    # The server makes this call, so ipinfo answers with the server's
+    # location for every visitor: one shared 24 h disk entry serves them all.
+    # After a failed lookup, skip the service for a minute unless the user
+    # explicitly asked for a fresh fix, which also bypasses the disk entry.
+    state = ip_lookup_state()
+    if not force and time.time() - state["fail_ts"] < IP_FAIL_RETRY_S:
+        return None, None
     try:
-        data = get_json("https://ipinfo.io/json", 6)
+        data = get_json("https://ipinfo.io/json", 6, disk_ttl=IP_CACHE_TTL_S,
+                        valid=lambda d: isinstance(d, dict) and bool(d.get("loc")),
+                        refresh=force)
         loc = data.get("loc")
         if not loc:
-            return None, None
+            raise ValueError("no loc in ipinfo response")
         lat, lon = loc.split(",")
-        return float(lat), float(lon)
+        lat, lon = float(lat), float(lon)
     except Exception:
+        state["fail_ts"] = time.time()
         return None, None
+    state["fail_ts"] = 0.0
+    return lat, lon
+
+def matches_by_label(matches):
+    # Built in reverse so a repeated label maps to its first match
+    return {m["label"]: m for m in reversed(matches)}
+
+def set_location(lat, lon, source):
+    st.session_state["lat"], st.session_state["lon"] = lat, lon
+    st.session_state["loc_source"] = source if lat is not None and lon is not None else ""
+    # Mirror the location into the URL so a refresh or bookmark restores it;
+    # src keeps an IP fix apart from a searched place across the reload
+    if lat is not None and lon is not None:
+        st.query_params.update({"lat": f"{lat:.4f}", "lon": f"{lon:.4f}", "src": source})
+    else:
+        for key in ("lat", "lon", "src"):
+            st.query_params.pop(key, None)
+    prefetch_wind(lat, lon)
+    prefetch_sun(lat, lon)
+
+def restore_location_from_url():
+    # Once per session. Only a saved IP fix (src=ip) stands in for the IP
+    # lookup; a saved place comes back as a place, so a blank search still
+    # asks for the current location just as it does before a reload.
+    if st.session_state.get("_url_loc_checked"):
+        return
+    st.session_state["_url_loc_checked"] = True
+    try:
+        lat = float(st.query_params["lat"])
+        lon = float(st.query_params["lon"])
+    except (KeyError, ValueError):
+        return
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        set_location(lat, lon, "ip" if st.query_params.get("src") == "ip" else "place")
+
+def use_current_location(force=False):
+    # The IP fix (or one restored from the URL) is shared by both pages;
+    # only an explicit tap refreshes it
+    if force or st.session_state.get("loc_source") != "ip":
+        lat, lon = get_location(force)
+        set_location(lat, lon, "ip")
+
+GEOCODE_TTL_S = 24 * 3600
+
+@st.cache_data(ttl=GEOCODE_TTL_S, max_entries=1024, show_spinner=False)
+def _fetch_geocode(q, count):
+    note_cache_miss("geocode")
+    url = api_url(GEOCODE_URL, {"name": q, "count": count, "language": "en", "format": "json"})
+    data = get_json(url, timeout=8, disk_ttl=GEOCODE_DISK_TTL_S)
+    results = data.get("results") or []
+
+    out = []
+    for r in results:
+        lat = r.get("latitude")
+        lon = r.get("longitude")
+        if lat is None or lon is None:
+            continue
+
+        name = str(r.get("name") or q)
+        admin1 = str(r.get("admin1") or "").strip()
+        country = str(r.get("country") or "").strip()
+
+        parts = [name]
+        if admin1:
+            parts.append(admin1)
+        if country:
+            parts.append(country)
+
+        display = ", ".join(parts)
+        out.append({"label": display, "lat": float(lat), "lon": float(lon)})
+
+    return out
 
 def geocode_search(place_name, count=10):
+    # Keyed on the normalized query, so spacing variants share an entry
+    q = normalize_place_query(place_name)
+    if not q:
+        return []
     try:
-        q = normalize_place_query(place_name)
-        if not q:
-            return []
-
-        url = (
-            "https://geocoding-api.open-meteo.com/v1/search"
-            "?name=" + requests.utils.quote(q) +
-            "&count=" + str(int(count)) + "&language=en&format=json"
-        )
-        data = get_json(url, timeout=8)
-        results = data.get("results") or []
-
-        out = []
-        for r in results:
-            lat = r.get("latitude")
-            lon = r.get("longitude")
-            if lat is None or lon is None:
-                continue
-
-            name = str(r.get("name") or q)
-            admin1 = str(r.get("admin1") or "").strip()
-            country = str(r.get("country") or "").strip()
-
-            parts = [name]
-            if admin1:
-                parts.append(admin1)
-            if country:
-                parts.append(country)
-
-            display = ", ".join(parts)
-            out.append({"label": display, "lat": float(lat), "lon": float(lon)})
-
-        return out
+        return cache_lookup("geocode", _fetch_geocode, q, int(count))
     except Exception:
         return []
 
+# Fetchers raise on failure so errors are never cached; the public
+# wrappers turn them into empty results.
+# Sunrise/sunset for a given place and date do not change, so they keep a day.
+SUN_TTL_S = 24 * 3600
+
+def cache_coords(lat, lon, digits=3):
+    # 3 decimals is ~110 m, finer than Open-Meteo's grid, so this is lossless
+    # for sun/wind data while letting geocoder/IP jitter share cache entries
+    # (both st.cache_data keys and the URLs used for the disk cache)
+    return round(float(lat), digits), round(float(lon), digits)
+
+# Wind is modelled on a grid of several km, so ~1 km keys lose nothing and
+# let nearby users (and nearby spots on one lake) share an entry
+WIND_COORD_DIGITS = 2
+
+@st.cache_data(ttl=SUN_TTL_S, max_entries=1024, show_spinner=False)
+def _fetch_sun_times_range(lat, lon, start_iso, end_iso):
+    note_cache_miss("sun")
+    url = api_url(FORECAST_URL, {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": start_iso,
+        "end_date": end_iso,
+        "daily": "sunrise,sunset",
+        "timezone": "auto",
+    })
+    data = get_json(url, disk_ttl=SUN_DISK_TTL_S)
+    daily = data["daily"]
+    out = {}
+    for d, sr, ss in zip(daily["time"], daily["sunrise"], daily["sunset"]):
+        out[d] = (datetime.fromisoformat(sr), datetime.fromisoformat(ss))
+    return out
+
 def get_sun_times(lat, lon, day_iso):
-    url = (
-        "https://api.open-meteo.com/v1/forecast"
-        "?latitude=" + str(lat) +
-        "&longitude=" + str(lon) +
-        "&start_date=" + day_iso +
-        "&end_date=" + day_iso +
-        "&daily=sunrise,sunset&timezone=auto"
-    )
+    # A single day is a one-day range, so it shares cache entries (and the
+    # disk URL) with the today-only range the prefetchers warm
     try:
-        data = get_json(url)
-        sr = data["daily"]["sunrise"][0]
-        ss = data["daily"]["sunset"][0]
-        return datetime.fromisoformat(sr), datetime.fromisoformat(ss)
+        return cache_lookup("sun", _fetch_sun_times_range, *cache_coords(lat, lon), day_iso, day_iso)[day_iso]
     except Exception:
         return None, None
 
-def best_times(lat, lon, day_obj):
-    day_iso = day_obj.isoformat()
-    sr, ss = get_sun_times(lat, lon, day_iso)
+MAX_RANGE_DAYS = 14
+
+class BestTimes(NamedTuple):
+    morning: tuple
+    evening: tuple
+
+_ONE_HOUR = timedelta(hours=1)
+
+def _windows_from_sun(sr, ss):
     if not sr or not ss:
         return None
-    return {
-        "morning": (sr - timedelta(hours=1), sr + timedelta(hours=1)),
-        "evening": (ss - timedelta(hours=1), ss + timedelta(hours=1)),
-    }
-
-def get_wind_hours(lat, lon):
-    url = (
-        "https://api.open-meteo.com/v1/forecast"
-        "?latitude=" + str(lat) +
-        "&longitude=" + str(lon) +
-        "&hourly=wind_speed_10m&wind_speed_unit=mph&timezone=auto"
+    return BestTimes(
+        morning=(sr - _ONE_HOUR, sr + _ONE_HOUR),
+        evening=(ss - _ONE_HOUR, ss + _ONE_HOUR),
     )
+
+def best_times(lat, lon, day_obj):
+    sr, ss = get_sun_times(lat, lon, day_obj.isoformat())
+    return _windows_from_sun(sr, ss)
+
+@st.cache_resource
+def http_executor():
+    # One I/O pool per process, shared by all sessions
+    return ThreadPoolExecutor(max_workers=8)
+
+def submit_io(fn, *args):
+    # Run fn on the I/O pool, counting its API calls in this session's stats
+    stats = _current_stats()
+
+    def run():
+        _net_local.stats = stats
+        try:
+            return fn(*args)
+        finally:
+            _net_local.stats = None
+
+    return http_executor().submit(run)
+
+def _warm_sun_range(lat, lon, start_iso, end_iso):
     try:
-        data = get_json(url)
-        out = {}
-        for t, s in zip(data["hourly"]["time"], data["hourly"]["wind_speed_10m"]):
-            out[t] = round(s, 1)
-        return out
+        cache_lookup("sun", _fetch_sun_times_range, *cache_coords(lat, lon), start_iso, end_iso)
     except Exception:
-        return {}
+        pass
 
-def split_current_future_winds(wind_by_time, now_local):
-    current = []
-    future = []
-    keys = sorted(list(wind_by_time.keys()))
-    for k in keys:
-        try:
-            dt = datetime.fromisoformat(k)
-        except Exception:
+def prefetch_sun(lat, lon):
+    # Fire-and-forget: fills the cache for the default today-only range so
+    # Best times renders from cache whichever page the user goes to first
+    if lat is None or lon is None:
+        return
+    day_iso = date.today().isoformat()
+    submit_io(_warm_sun_range, lat, lon, day_iso, day_iso)
+
+def best_times_for_days(lat, lon, day_list):
+    # One range request covers every day in the list
+    try:
+        sun = cache_lookup(
+            "sun", _fetch_sun_times_range,
+            *cache_coords(lat, lon), day_list[0].isoformat(), day_list[-1].isoformat(),
+        )
+    except Exception:
+        # A range reaching past the forecast horizon fails as a whole:
+        # fall back to per-day lookups so the days in range still show
+        futures = [submit_io(best_times, lat, lon, d) for d in day_list]
+        return [f.result() for f in futures]
+    return [_windows_from_sun(*sun.get(d.isoformat(), (None, None))) for d in day_list]
+
+def best_times_rows(lat, lon, day_list):
+    # (heading, cards HTML or None) per day. Kept in session state while the
+    # location and range are unchanged, so widget reruns skip the lookup and
+    # formatting. Results with a failed day are not kept, so they retry.
+    key = (lat, lon, day_list[0], day_list[-1])
+    saved = st.session_state.get("best_rows")
+    if saved and saved[0] == key:
+        return saved[1]
+
+    rows = []
+    for d, times in zip(day_list, best_times_for_days(lat, lon, day_list)):
+        heading = f"## {d:%A - %b %d, %Y}"
+        if not times:
+            rows.append((heading, None))
             continue
-        mph = wind_by_time.get(k)
-        label = dt.strftime("%a %b %d, %I %p").replace(" 0", " ").replace(":00", "")
-        if dt <= now_local:
-            current.append((label, mph))
-        else:
-            future.append((label, mph))
-    current = current[-6:]
-    future = future[:12]
+        m0, m1 = times.morning
+        e0, e1 = times.evening
+        rows.append((
+            heading,
+            WINDOW_CARD_TMPL % ("Morning window", fmt_time(m0), fmt_time(m1)) +
+            WINDOW_CARD_TMPL % ("Evening window", fmt_time(e0), fmt_time(e1)),
+        ))
+
+    if all(cards_html for _, cards_html in rows):
+        st.session_state["best_rows"] = (key, rows)
+    return rows
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_wind_hours(lat, lon):
+    note_cache_miss("wind")
+    url = api_url(FORECAST_URL, {
+        "latitude": lat,
+        "longitude": lon,
+        "hourly": "wind_speed_10m",
+        "wind_speed_unit": "mph",
+        "timezone": "auto",
+    })
+    data = get_json(url)
+    # Open-Meteo returns hourly times strictly ascending with no duplicates,
+    # so keep them as ordered (time, label, mph) rows. Labels are built here,
+    # once per cache TTL, instead of on every Wind page rerun.
+    return [
+        (t, hour_label(datetime.fromisoformat(t)), round(s, 1))
+        for t, s in zip(data["hourly"]["time"], data["hourly"]["wind_speed_10m"])
+    ]
+
+def get_wind_hours(lat, lon):
+    try:
+        return cache_lookup("wind", _fetch_wind_hours, *cache_coords(lat, lon, WIND_COORD_DIGITS))
+    except Exception:
+        return []
+
+def prefetch_wind(lat, lon):
+    # Start the wind fetch as soon as a location is set so the Wind page
+    # (this run or after switching pages) finds it done or in flight
+    if lat is None or lon is None:
+        return
+    pending = st.session_state.get("wind_future")
+    if pending and pending[0] == (lat, lon):
+        return
+    st.session_state["wind_future"] = ((lat, lon), submit_io(get_wind_hours, lat, lon))
+
+def release_finished_prefetch():
+    # A finished wind fetch has already filled the st.cache_data entry, so
+    # the session need not keep the future (and its rows) around
+    pending = st.session_state.get("wind_future")
+    if pending and pending[1].done():
+        st.session_state.pop("wind_future", None)
+
+def wind_for_location(lat, lon):
+    pending = st.session_state.get("wind_future")
+    if pending and pending[0] == (lat, lon):
+        # Consume once; later reruns go through the TTL cache
+        st.session_state.pop("wind_future", None)
+        return pending[1].result()
+    return get_wind_hours(lat, lon)
+
+def hour_label(dt):
+    # "Mon Jan 5, 3 PM" without zero padding (no strftime + replace pass)
+    return f"{dt:%a %b} {dt.day}, {dt.hour % 12 or 12} {'AM' if dt.hour < 12 else 'PM'}"
+
+def split_current_future_winds(rows, now_local):
+    # Hour keys are local ISO times ("YYYY-MM-DDTHH:MM"), already ascending
+    # from the API: split with one binary search and slice the shown hours
+    idx = bisect_right(rows, now_local.strftime("%Y-%m-%dT%H:%M"), key=itemgetter(0))
+    current = [(label, mph) for _, label, mph in rows[max(0, idx - 6):idx]]
+    future = [(label, mph) for _, label, mph in rows[idx:idx + 12]]
     return current, future
 
+# Lakes most users look up. Warmed once per process through the same
+# geocode query and cache keys a user search would hit, so the first
+# visitor for these spots reads from cache.
+POPULAR_SPOTS = [
+    "Hauser Lake, Idaho",
+    "Hayden Lake, Idaho",
+    "Coeur d'Alene Lake, Idaho",
+    "Lake Pend Oreille, Idaho",
+    "Priest Lake, Idaho",
+    "Spirit Lake, Idaho",
+    "Fernan Lake, Idaho",
+    "Newman Lake, Washington",
+    "Long Lake, Washington",
+    "Lake Roosevelt, Washington",
+]
+
+def _warm_spot(place_name, day_iso):
+    matches = geocode_search(place_name, count=10)
+    if not matches:
+        return
+    lat, lon = matches[0]["lat"], matches[0]["lon"]
+    _warm_sun_range(lat, lon, day_iso, day_iso)
+    get_wind_hours(lat, lon)
+
+def _warm_spots(day_iso):
+    for place_name in POPULAR_SPOTS:
+        _warm_spot(place_name, day_iso)
+
+@st.cache_resource(max_entries=1)
+def warm_popular_spots(day_iso):
+    # Once per process per day (the date is the cache key). One daemon
+    # thread works through the spots in turn, so the warm-up never queues
+    # ahead of visitors' own prefetches on the shared I/O pool.
+    threading.Thread(target=_warm_spots, args=(day_iso,), daemon=True).start()
+    return True
+
+LINE_TYPE_DRAG = {"Braid": 1.0, "Fluorocarbon": 1.12, "Monofilament": 1.2}
+LINE_TESTS_LB = [6, 8, 10, 12, 15, 20, 25, 30, 40, 50]
+
 def trolling_depth(speed_mph, weight_oz, line_out_ft, line_type, line_test_lb):
-    if speed_mph <= 0 or weight_oz <= 0 or line_out_ft <= 0 or line_test_lb <= 0:
+    if min(speed_mph, weight_oz, line_out_ft, line_test_lb) <= 0:
         return None
 
-    type_drag = {"Braid": 1.0, "Fluorocarbon": 1.12, "Monofilament": 1.2}[line_type]
-    test_ratio = line_test_lb / 20.0
-    test_drag = test_ratio ** 0.35
-    total_drag = type_drag * test_drag
+    total_drag = LINE_TYPE_DRAG[line_type] * (line_test_lb / 20.0) ** 0.35
 
     depth = 0.135 * (weight_oz / (total_drag * (speed_mph ** 1.35))) * line_out_ft
     return round(depth, 1)
 
+@st.fragment
+def depth_calculator():
+    # Fragment: a Calculate tap reruns only this panel, not the header,
+    # nav and the rest of the script
+    # One rerun per Calculate tap instead of one per input step
+    with st.form("depth_form"):
+        speed = st.number_input("Speed (mph)", 0.0, value=1.3, step=0.1)
+        weight = st.number_input("Weight (oz)", 0.0, value=2.0, step=0.5)
+        line_out = st.number_input("Line out (feet)", 0.0, value=100.0, step=5.0)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            line_type = st.radio("Line type", list(LINE_TYPE_DRAG))
+        with col2:
+            line_test = st.selectbox("Line test (lb)", LINE_TESTS_LB, index=3)
+
+        st.form_submit_button("Calculate depth", use_container_width=True)
+
+    depth = trolling_depth(speed, weight, line_out, line_type, line_test)
+
+    st.markdown(
+        "<div class='card'><div class='card-title'>Estimated depth</div>"
+        f"<div class='card-value'>{depth if depth is not None else '--'} ft</div>"
+        "<div class='small' style='margin-top:8px;'>Heavier line runs shallower. Current and lure drag also affect results.</div>"
+        "</div>",
+        unsafe_allow_html=True,
+    )
+
 # -------------------------------------------------
 # Species tips
 # -------------------------------------------------
@@ -595,61 +976,70 @@ def species_tip_db():
         },
     }
 
-def render_species_tips(name, db):
-    info = db.get(name)
+@st.cache_resource
+def species_db():
+    # Static data: build once per process instead of on every rerun
+    return species_tip_db()
+
+DEFAULT_SPECIES = "Largemouth bass"
+
+@st.cache_resource
+def species_names():
+    return sorted(species_db())
+
+@st.cache_resource
+def default_species_index():
+    names = species_names()
+    return names.index(DEFAULT_SPECIES) if DEFAULT_SPECIES in names else 0
+
+def _bullets_html(items):
+    return "<ul class='bul'>" + "".join(f"<li>{escape(x)}</li>" for x in items) + "</ul>"
+
+@st.cache_data(show_spinner=False)
+def species_tips_html(name):
+    # Species data is static, so the whole page body is a pure function of the name
+    info = species_db().get(name)
     if not info:
-        st.warning("No tips found.")
-        return
+        return ""
 
     lo, hi = info.get("temp_f", (None, None))
     depths = info.get("Depths", [])
     baits = info.get("Baits", [])
     rigs = info.get("Rigs", [])
 
-    st.markdown(
+    parts = [
         "<div class='card'>"
         "<div class='card-title'>Species</div>"
-        "<div class='card-value'>" + name + "</div>"
-        "</div>",
-        unsafe_allow_html=True,
-    )
+        f"<div class='card-value'>{escape(name)}</div>"
+        "</div>"
+    ]
 
     if lo is not None and hi is not None:
-        st.markdown(
+        parts.append(
             "<div class='card'>"
             "<div class='card-title'>Most active water temperature range</div>"
-            "<div class='card-value'>" + str(lo) + " to " + str(hi) + " F</div>"
-            "</div>",
-            unsafe_allow_html=True,
+            f"<div class='card-value'>{lo} to {hi} F</div>"
+            "</div>"
         )
 
     if baits:
-        st.markdown(
+        parts.append(
             "<div class='card'>"
-            "<div class='card-title'>Popular baits</div>"
-            "<ul class='bul'>" + "".join(["<li>" + x + "</li>" for x in baits]) + "</ul>"
-            "</div>",
-            unsafe_allow_html=True,
+            f"<div class='card-title'>Popular baits</div>{_bullets_html(baits)}"
+            "</div>"
         )
 
     if rigs:
-        st.markdown(
+        parts.append(
             "<div class='card'>"
-            "<div class='card-title'>Common rigs</div>"
-            "<ul class='bul'>" + "".join(["<li>" + x + "</li>" for x in rigs]) + "</ul>"
-            "</div>",
-            unsafe_allow_html=True,
+            f"<div class='card-title'>Common rigs</div>{_bullets_html(rigs)}"
+            "</div>"
         )
 
     def section(title, key):
         items = info.get(key, [])
-        if not items:
-            return
-        st.markdown("<div class='tip-h'>" + title + "</div>", unsafe_allow_html=True)
-        st.markdown(
-            "<ul class='bul'>" + "".join(["<li>" + x + "</li>" for x in items]) + "</ul>",
-            unsafe_allow_html=True,
-        )
+        if items:
+            parts.append(f"<div class='tip-h'>{title}</div>{_bullets_html(items)}")
 
     if "Top" in depths:
         section("Topwater", "Top")
@@ -658,11 +1048,24 @@ def render_species_tips(name, db):
     if "Bottom" in depths:
         section("Bottom", "Bottom")
 
-    if info.get("Quick"):
-        section("Quick tips", "Quick")
+    section("Quick tips", "Quick")
 
-def phone_speedometer_widget():
-    html = """
+    return "".join(parts)
+
+def render_species_tips(name):
+    html = species_tips_html(name)
+    if not html:
+        st.warning("No tips found.")
+        return
+    st.markdown(html, unsafe_allow_html=True)
+
+@st.fragment
+def species_tips_panel():
+    # Fragment: picking a species reruns only the picker and its tips
+    species = st.selectbox("Species", species_names(), index=default_species_index())
+    render_species_tips(species)
+
+SPEEDOMETER_HTML = """
     <div id="wrap" style="padding:12px;border:1px solid rgba(0,0,0,0.14);border-radius:18px;background:rgba(0,0,0,0.03);">
       <style>
         #wrap { --dial: 112px; --mph: 34px; --gap: 12px; }
@@ -727,7 +1130,9 @@ def phone_speedometer_widget():
       }
     </script>
     """
-    components.html(html, height=240)
+
+def phone_speedometer_widget():
+    components.html(SPEEDOMETER_HTML, height=240)
 
 # -------------------------------------------------
 # Header + Top Nav (NO DUPLICATES)
@@ -741,38 +1146,71 @@ PAGE_TITLES = {
     "Speedometer": "Speedometer",
 }
 
-def render_header():
-    title = PAGE_TITLES.get(st.session_state["tool"], "")
-    st.markdown(
-        "<div class='header-row'>"
-        "<div class='header-logo'><img src='" + LOGO_URL + "'></div>"
-        "<div class='header-title'>" + title + "<div class='small'>v " + APP_VERSION + "</div></div>"
-        "</div>",
-        unsafe_allow_html=True,
+@st.cache_resource
+def logo_src():
+    # The header markdown is re-sent on every rerun, so point at the remote
+    # logo (one fetch the browser caches) rather than inlining ~10 KB of
+    # base64 each time. The bundled copy only stands in when no URL is set.
+    if LOGO_URL:
+        return LOGO_URL
+    try:
+        with open(LOGO_FILE, "rb") as f:
+            return "data:image/png;base64," + base64.b64encode(f.read()).decode("ascii")
+    except OSError:
+        return ""
+
+def _build_header_html(title):
+    return (
+        f"<div class='header-row'><div class='header-logo'><img src='{logo_src()}'></div>"
+        f"<div class='header-title'>{title}<div class='small'>v {APP_VERSION}</div></div>"
+        "</div>"
     )
 
+@st.cache_resource
+def page_header_html():
+    # Built once per process (the script body itself re-runs on every rerun)
+    return {tool_name: _build_header_html(title) for tool_name, title in PAGE_TITLES.items()}
+
+def render_header():
+    html = page_header_html().get(st.session_state["tool"]) or _build_header_html("")
+    st.markdown(html, unsafe_allow_html=True)
+
+NAV_ITEMS = [
+    ("Times", "Best fishing times"),
+    ("Wind", "Wind forecast"),
+    ("Depth", "Trolling depth calculator"),
+    ("Tips", "Species tips"),
+    ("Speed", "Speedometer"),
+]
+
+def _go_to(tool_name):
+    # Button callback: runs before the rerun the click triggers, so the
+    # header and page body already see the new tool (no st.rerun needed)
+    st.session_state["tool"] = tool_name
+    if tool_name == "Best fishing times":
+        st.session_state["best_go"] = False
+
 def top_nav(active):
     st.markdown("<div class='nav-row'></div>", unsafe_allow_html=True)
 
-    cols = st.columns(5)
-    items = [
-        ("Times", "Best fishing times"),
-        ("Wind", "Wind forecast"),
-        ("Depth", "Trolling depth calculator"),
-        ("Tips", "Species tips"),
-        ("Speed", "Speedometer"),
-    ]
-
-    for i, (label, tool_name) in enumerate(items):
+    cols = st.columns(len(NAV_ITEMS))
+    for i, (label, tool_name) in enumerate(NAV_ITEMS):
         with cols[i]:
             if tool_name == active:
                 st.markdown("<div class='nav-active'>" + label + "</div>", unsafe_allow_html=True)
             else:
-                if st.button(label, use_container_width=True, key="nav_" + label):
-                    st.session_state["tool"] = tool_name
-                    if tool_name == "Best fishing times":
-                        st.session_state["best_go"] = False
-                    st.rerun()
+                st.button(
+                    label,
+                    use_container_width=True,
+                    key="nav_" + label,
+                    on_click=_go_to,
+                    args=(tool_name,),
+                )
+
+_net_local.stats = net_stats()
+warm_popular_spots(date.today().isoformat())
+restore_location_from_url()
+release_finished_prefetch()
 
 render_header()
 top_nav(st.session_state["tool"])
@@ -808,28 +1246,22 @@ if tool == "Best fishing times":
             st.session_state["best_place_matches"] = []
             st.session_state["best_place_choice"] = ""
             st.session_state["best_place_display"] = ""
-            st.session_state["lat"], st.session_state["lon"] = get_location()
+            use_current_location(force=True)
 
     matches = st.session_state.get("best_place_matches") or []
+    by_label = matches_by_label(matches)
     if matches:
         labels = [m["label"] for m in matches]
         choice = st.selectbox("Choose the correct match", labels, index=0, key="best_place_choice_select")
         st.session_state["best_place_choice"] = choice
 
-    # ACTION BUTTON must be light red on this page
-    inject_button_color_by_text("Display Best Fishing Times", "#f4a3a3", "#3b0a0a", "#e48f8f", 80)
-
-    if st.button("Display Best Fishing Times", use_container_width=True, key="go_best_times"):
+    # ACTION BUTTON must be light red on this page (primary, see APP_CSS)
+    if st.button("Display Best Fishing Times", type="primary", use_container_width=True, key="go_best_times"):
         st.session_state["best_go"] = True
 
         q = normalize_place_query(place)
         if q:
-            chosen_label = st.session_state.get("best_place_choice", "")
-            chosen = None
-            for m in matches:
-                if m["label"] == chosen_label:
-                    chosen = m
-                    break
+            chosen = by_label.get(st.session_state.get("best_place_choice", ""))
 
             if chosen is None:
                 matches2 = geocode_search(q, count=10)
@@ -839,13 +1271,13 @@ if tool == "Best fishing times":
                 st.session_state["best_place_choice"] = chosen["label"] if chosen else ""
 
             if chosen:
-                st.session_state["lat"], st.session_state["lon"] = chosen["lat"], chosen["lon"]
+                set_location(chosen["lat"], chosen["lon"], "place")
                 st.session_state["best_place_display"] = chosen["label"]
             else:
-                st.session_state["lat"], st.session_state["lon"] = None, None
+                set_location(None, None, "")
                 st.session_state["best_place_display"] = ""
         else:
-            st.session_state["lat"], st.session_state["lon"] = get_location()
+            use_current_location()
             st.session_state["best_place_display"] = ""
 
     if st.session_state.get("best_go"):
@@ -854,7 +1286,7 @@ if tool == "Best fishing times":
         display_place = st.session_state.get("best_place_display", "")
 
         if display_place:
-            st.markdown("<div class='small'><strong>Using:</strong> " + display_place + "</div>", unsafe_allow_html=True)
+            st.markdown(USING_TMPL % escape(display_place), unsafe_allow_html=True)
 
         st.markdown("### Date range")
         d0, d1 = st.columns(2)
@@ -873,47 +1305,26 @@ if tool == "Best fishing times":
             else:
                 st.warning("Could not detect your location. Try entering a place name or ZIP code.")
         else:
-            day_list = []
-            cur = start_day
-            while cur <= end_day:
-                day_list.append(cur)
-                if len(day_list) >= 14:
-                    break
-                cur = cur + timedelta(days=1)
-
-            if len(day_list) == 14 and end_day > day_list[-1]:
-                st.info("Showing first 14 days only. Shorten the range to see more detail.")
+            span_days = (end_day - start_day).days + 1
+            day_list = [start_day + timedelta(days=i) for i in range(min(MAX_RANGE_DAYS, span_days))]
 
-            for d in day_list:
-                st.markdown("## " + d.strftime("%A") + " - " + d.strftime("%b %d, %Y"))
+            if span_days > MAX_RANGE_DAYS:
+                st.info("Showing first 14 days only. Shorten the range to see more detail.")
 
-                times = best_times(lat, lon, d)
-                if not times:
-                    st.warning("Unable to calculate fishing times for this day.")
+            # Consecutive days go out as one markdown element; only a day that
+            # failed breaks the run to show its warning
+            block = []
+            for heading, cards_html in best_times_rows(lat, lon, day_list):
+                if cards_html:
+                    block.append(f"{heading}\n\n{cards_html}")
                     continue
-
-                m0, m1 = times["morning"]
-                e0, e1 = times["evening"]
-
-                st.markdown(
-                    "<div class='card compact-card'><div class='card-title'>Morning window</div>"
-                    "<div class='card-value'>" +
-                    m0.strftime("%I:%M %p").lstrip("0") +
-                    " - " +
-                    m1.strftime("%I:%M %p").lstrip("0") +
-                    "</div></div>",
-                    unsafe_allow_html=True,
-                )
-
-                st.markdown(
-                    "<div class='card compact-card'><div class='card-title'>Evening window</div>"
-                    "<div class='card-value'>" +
-                    e0.strftime("%I:%M %p").lstrip("0") +
-                    " - " +
-                    e1.strftime("%I:%M %p").lstrip("0") +
-                    "</div></div>",
-                    unsafe_allow_html=True,
-                )
+                if block:
+                    st.markdown("\n\n".join(block), unsafe_allow_html=True)
+                    block = []
+                st.markdown(heading)
+                st.warning("Unable to calculate fishing times for this day.")
+            if block:
+                st.markdown("\n\n".join(block), unsafe_allow_html=True)
 
 elif tool == "Wind forecast":
     st.markdown("### Wind forecast")
@@ -944,26 +1355,20 @@ elif tool == "Wind forecast":
             st.session_state["wind_place_matches"] = []
             st.session_state["wind_place_choice"] = ""
             st.session_state["wind_place_display"] = ""
-            st.session_state["lat"], st.session_state["lon"] = get_location()
+            use_current_location(force=True)
 
     matches = st.session_state.get("wind_place_matches") or []
+    by_label = matches_by_label(matches)
     if matches:
         labels = [m["label"] for m in matches]
         choice = st.selectbox("Choose the correct match", labels, index=0, key="wind_place_choice_select")
         st.session_state["wind_place_choice"] = choice
 
-    # ACTION BUTTON must be light red on this page
-    inject_button_color_by_text("Display winds", "#f4a3a3", "#3b0a0a", "#e48f8f", 80)
-
-    if st.button("Display winds", use_container_width=True, key="go_winds"):
+    # ACTION BUTTON must be light red on this page (primary, see APP_CSS)
+    if st.button("Display winds", type="primary", use_container_width=True, key="go_winds"):
         q = normalize_place_query(place)
         if q:
-            chosen_label = st.session_state.get("wind_place_choice", "")
-            chosen = None
-            for m in matches:
-                if m["label"] == chosen_label:
-                    chosen = m
-                    break
+            chosen = by_label.get(st.session_state.get("wind_place_choice", ""))
 
             if chosen is None:
                 matches2 = geocode_search(q, count=10)
@@ -973,13 +1378,13 @@ elif tool == "Wind forecast":
                 st.session_state["wind_place_choice"] = chosen["label"] if chosen else ""
 
             if chosen:
-                st.session_state["lat"], st.session_state["lon"] = chosen["lat"], chosen["lon"]
+                set_location(chosen["lat"], chosen["lon"], "place")
                 st.session_state["wind_place_display"] = chosen["label"]
             else:
-                st.session_state["lat"], st.session_state["lon"] = None, None
+                set_location(None, None, "")
                 st.session_state["wind_place_display"] = ""
         else:
-            st.session_state["lat"], st.session_state["lon"] = get_location()
+            use_current_location()
             st.session_state["wind_place_display"] = ""
 
     lat = st.session_state.get("lat")
@@ -987,7 +1392,7 @@ elif tool == "Wind forecast":
     display_place = st.session_state.get("wind_place_display", "")
 
     if display_place:
-        st.markdown("<div class='small'><strong>Using:</strong> " + display_place + "</div>", unsafe_allow_html=True)
+        st.markdown(USING_TMPL % escape(display_place), unsafe_allow_html=True)
 
     if lat is None or lon is None:
         if normalize_place_query(place):
@@ -995,75 +1400,76 @@ elif tool == "Wind forecast":
         else:
             st.info("Tap Display winds. If location fails, enter a place name or ZIP code.")
     else:
-        wind = get_wind_hours(lat, lon)
+        wind = wind_for_location(lat, lon)
         now_local = datetime.now()
 
         current, future = split_current_future_winds(wind, now_local)
 
         if current:
             st.markdown("#### Current winds")
-            for label, mph in current:
-                st.markdown(
-                    "<div class='card compact-card'><div class='card-title'>" + label +
-                    "</div><div class='card-value'>" + str(mph) + " mph</div></div>",
-                    unsafe_allow_html=True,
-                )
+            st.markdown(
+                "".join(WIND_CARD_TMPL % (label, mph) for label, mph in current),
+                unsafe_allow_html=True,
+            )
 
         if future:
             st.markdown("#### Future winds")
-            for label, mph in future:
-                st.markdown(
-                    "<div class='card compact-card'><div class='card-title'>" + label +
-                    "</div><div class='card-value'>" + str(mph) + " mph</div></div>",
-                    unsafe_allow_html=True,
-                )
+            st.markdown(
+                "".join(WIND_CARD_TMPL % (label, mph) for label, mph in future),
+                unsafe_allow_html=True,
+            )
 
 elif tool == "Trolling depth calculator":
     st.markdown("### Trolling depth calculator")
     st.markdown("<div class='small'>Location not required.</div>", unsafe_allow_html=True)
 
-    speed = st.number_input("Speed (mph)", 0.0, value=1.3, step=0.1)
-    weight = st.number_input("Weight (oz)", 0.0, value=2.0, step=0.5)
-    line_out = st.number_input("Line out (feet)", 0.0, value=100.0, step=5.0)
-
-    col1, col2 = st.columns(2)
-    with col1:
-        line_type = st.radio("Line type", ["Braid", "Fluorocarbon", "Monofilament"])
-    with col2:
-        line_test = st.selectbox("Line test (lb)", [6, 8, 10, 12, 15, 20, 25, 30, 40, 50], index=3)
-
-    depth = trolling_depth(speed, weight, line_out, line_type, line_test)
-
-    st.markdown(
-        "<div class='card'><div class='card-title'>Estimated depth</div>"
-        "<div class='card-value'>" +
-        (str(depth) if depth is not None else "--") + " ft</div>"
-        "<div class='small' style='margin-top:8px;'>Heavier line runs shallower. Current and lure drag also affect results.</div>"
-        "</div>",
-        unsafe_allow_html=True,
-    )
+    depth_calculator()
 
 elif tool == "Species tips":
     st.markdown("### Species tips")
     st.markdown("<div class='small'>Pick a species and get tips plus its best activity temperature range, popular baits, and common rigs.</div>", unsafe_allow_html=True)
 
-    db = species_tip_db()
-    species_list = sorted(list(db.keys()))
-
-    default_species = "Largemouth bass"
-    try:
-        default_index = species_list.index(default_species)
-    except Exception:
-        default_index = 0
-
-    species = st.selectbox("Species", species_list, index=default_index)
-    render_species_tips(species, db)
+    species_tips_panel()
 
 else:
     st.markdown("### Speedometer")
     st.markdown("<div class='small'>GPS speed from your phone browser. Works best once GPS has a lock and you are moving.</div>", unsafe_allow_html=True)
     phone_speedometer_widget()
 
+# -------------------------------------------------
+# Debug (?debug=<token>): this session's API calls and cache counters.
+# Off unless a debug_token is set in st.secrets.
+# -------------------------------------------------
+def debug_enabled():
+    try:
+        token = st.secrets.get("debug_token")
+    except Exception:
+        token = None
+    given = st.query_params.get("debug")
+    return bool(token) and bool(given) and hmac.compare_digest(
+        str(given).encode("utf-8"), str(token).encode("utf-8"))
+
+if debug_enabled():
+    stats = net_stats()
+    with st.expander("Debug: API calls (this session)"):
+        st.table([
+            {
+                "cache": name,
+                "lookups": stats.lookups[name],
+                "hits": stats.lookups[name] - stats.misses[name],
+                "misses": stats.misses[name],
+            }
+            for name in ("geocode", "sun", "wind")
+        ])
+        rows = [
+            {"source": source, "ms": round(seconds * 1000.0, 1), "endpoint": endpoint}
+            for source, seconds, endpoint in reversed(stats.calls)
+        ]
+        if rows:
+            st.table(rows)
+        else:
+            st.write("No API calls in this session yet.")
+
 # -------------------------------------------------
 # Footer
 # -------------------------------------------------